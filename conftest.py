@@ -0,0 +1,4 @@
+"""
+Pytest configuration: makes the repository root importable so the tests can
+import the `src` package without installing it first
+"""
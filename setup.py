@@ -17,6 +17,14 @@ setup(
         "reportlab==4.0.7",
         "markdown2==2.4.10",
     ],
+    extras_require={
+        # Optional tree-sitter backend for the gas analyzer (--parser ast).
+        # Needs the tree-sitter 0.25 API, which is only released for 3.10+.
+        'ast': [
+            'tree-sitter>=0.25; python_version >= "3.10"',
+            'tree-sitter-solidity>=1.2; python_version >= "3.10"',
+        ],
+    },
     entry_points={
         'console_scripts': [
             'secudity=src.cli:cli',
@@ -0,0 +1,6 @@
+"""
+Secudity CLI subcommands
+
+Each module defines one subcommand and exposes it as ``command``. Modules
+are imported by ``cli.LazyGroup`` only when their subcommand is used.
+"""
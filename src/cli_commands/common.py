@@ -0,0 +1,141 @@
+"""
+Secudity CLI - Shared helpers for subcommands
+"""
+
+from collections import Counter
+from functools import lru_cache
+from operator import attrgetter
+
+import click
+
+_console = None
+
+_severity = attrgetter('severity')
+
+
+def get_console():
+    """Return the shared rich console, creating it on first use"""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+@lru_cache(maxsize=None)
+def _severity_colors():
+    """Rich colour for each severity, built once on first use"""
+    from src.scanner.vulnerability_detector import Severity
+    
+    return {
+        Severity.CRITICAL: "red",
+        Severity.HIGH: "orange1",
+        Severity.MEDIUM: "yellow",
+        Severity.LOW: "blue",
+        Severity.INFORMATIONAL: "white"
+    }
+
+
+def require_parser(parser):
+    """Fail with a usage error if the requested gas backend is not installed"""
+    if parser != 'ast':
+        return
+    from src.utils.contract_parser import AST_AVAILABLE
+    
+    if not AST_AVAILABLE:
+        raise click.UsageError(
+            "--parser ast requires Python 3.10+ with tree-sitter and "
+            "tree-sitter-solidity. Install them with: "
+            "pip install 'secudity-audit-toolkit[ast]'"
+        )
+
+
+def run_analyses(contract_path, gas_backend='regex'):
+    """
+    Run the vulnerability and gas analyzers on a contract concurrently
+    
+    Args:
+        contract_path: Path to the Solidity contract file
+        gas_backend: Gas analyzer backend, 'regex' or 'ast'
+    
+    Returns:
+        Tuple of (vulnerabilities, gas_optimizations)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    from src.scanner._source_cache import read_contract
+    from src.scanner.vulnerability_detector import analyze_contract
+    from src.scanner.gas_analyzer import analyze_gas
+    
+    # Read the file once and hand the same source to both analyzers
+    contract_code = read_contract(contract_path)
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        vuln_future = executor.submit(analyze_contract, contract_path, contract_code)
+        gas_future = executor.submit(analyze_gas, contract_path, contract_code, gas_backend)
+        return vuln_future.result(), gas_future.result()
+
+
+def _build_summary_table(critical, high, medium, low, gas_count):
+    """Build the findings summary table"""
+    from rich.table import Table
+    
+    summary_table = Table(title="🛡️  Security Findings Summary", show_header=True, header_style="bold magenta")
+    summary_table.add_column("Severity", style="dim")
+    summary_table.add_column("Count", justify="right")
+    summary_table.add_column("Status", justify="center")
+    
+    def get_status(count):
+        return "🔴" if count > 0 else "✅"
+    
+    summary_table.add_row("🔴 Critical", str(critical), get_status(critical))
+    summary_table.add_row("🟠 High", str(high), get_status(high))
+    summary_table.add_row("🟡 Medium", str(medium), get_status(medium))
+    summary_table.add_row("🔵 Low", str(low), get_status(low))
+    summary_table.add_row("⚡ Gas Issues", str(gas_count), "ℹ️")
+    
+    return summary_table
+
+
+def display_results(vulnerabilities, gas_optimizations, verbose=False):
+    """Display scan results in a formatted table"""
+    from src.scanner.vulnerability_detector import Severity
+
+    console = get_console()
+    
+    # Vulnerability summary
+    counts = Counter(map(_severity, vulnerabilities))
+    critical = counts[Severity.CRITICAL]
+    high = counts[Severity.HIGH]
+    medium = counts[Severity.MEDIUM]
+    low = counts[Severity.LOW]
+    gas_count = len(gas_optimizations)
+    
+    # Nothing to tabulate on a clean contract
+    if not vulnerabilities and not gas_optimizations:
+        console.print("[green]✅ No issues found[/green]")
+        return
+    
+    console.print(_build_summary_table(critical, high, medium, low, gas_count))
+    
+    # Detailed findings if verbose
+    if verbose and vulnerabilities:
+        from rich.table import Table
+        
+        console.print("\n")
+        findings_table = Table(title="Detailed Findings", show_header=True, header_style="bold cyan")
+        findings_table.add_column("Line", style="dim", width=6)
+        findings_table.add_column("Severity", width=10)
+        findings_table.add_column("Issue", width=40)
+        
+        severity_colors = _severity_colors()
+        for vuln in vulnerabilities[:10]:  # Show top 10
+            severity_color = severity_colors.get(vuln.severity, "white")
+            
+            findings_table.add_row(
+                str(vuln.line_number),
+                f"[{severity_color}]{vuln.severity.value}[/{severity_color}]",
+                vuln.name
+            )
+        
+        console.print(findings_table)
@@ -0,0 +1,29 @@
+"""
+Secudity CLI - quick command
+"""
+
+import click
+
+from src.cli_commands.common import get_console, display_results, require_parser, run_analyses
+
+
+@click.command('quick')
+@click.argument('contract_path', type=click.Path(exists=True))
+@click.option('--parser', type=click.Choice(['regex', 'ast']), default='regex',
+              help="Gas analyzer backend ('ast' needs the [ast] extra)")
+def quick(contract_path, parser):
+    """
+    Quick scan with summary output only
+    
+    Example: secudity quick MyContract.sol
+    """
+    require_parser(parser)
+    console = get_console()
+    console.print("[blue]🔍 Running quick scan...[/blue]\n")
+    
+    vulnerabilities, gas_optimizations = run_analyses(contract_path, parser)
+    
+    display_results(vulnerabilities, gas_optimizations, verbose=False)
+
+
+command = quick
@@ -0,0 +1,109 @@
+"""
+Secudity CLI - scan command
+"""
+
+import os
+
+import click
+
+from src.cli_commands.common import get_console, display_results, require_parser, run_analyses
+
+
+def _write_report(contract_path, contract_name, output, vulnerabilities, gas_optimizations):
+    """Write the markdown report into the output directory and return its path"""
+    from datetime import datetime
+
+    from src.reporter.markdown_generator import generate_markdown_report
+
+    os.makedirs(output, exist_ok=True)
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_filename = f"{contract_name}_audit_{timestamp}.md"
+    report_path = os.path.join(output, report_filename)
+    
+    return generate_markdown_report(
+        contract_path,
+        vulnerabilities,
+        gas_optimizations,
+        report_path,
+        contract_name
+    )
+
+
+@click.command('scan')
+@click.argument('contract_path', type=click.Path(exists=True))
+@click.option('--output', '-o', default='output', help='Output directory for reports')
+@click.option('--format', '-f', type=click.Choice(['markdown', 'pdf', 'all']), 
+              default='markdown', help='Report format')
+@click.option('--verbose', '-v', is_flag=True, help='Verbose output')
+@click.option('--parser', type=click.Choice(['regex', 'ast']), default='regex',
+              help="Gas analyzer backend ('ast' needs the [ast] extra)")
+def scan(contract_path, output, format, verbose, parser):
+    """
+    Scan a Solidity contract for vulnerabilities and generate report
+    
+    Example: secudity scan MyContract.sol -o reports/
+    """
+    require_parser(parser)
+    console = get_console()
+    # Spinners and panels only help an interactive user; when output is
+    # captured (CI logs, pipes) skip them along with rich's refresh thread.
+    interactive = console.is_terminal
+    
+    if interactive:
+        from rich.panel import Panel
+        
+        console.print(Panel.fit(
+            "[bold blue]🔍 Secudity Audit Toolkit[/bold blue]\n"
+            "[dim]Security + Solidity[/dim]",
+            border_style="blue"
+        ))
+    else:
+        console.print("🔍 Secudity Audit Toolkit - Security + Solidity")
+    
+    # Validate contract file
+    from pathlib import Path
+    
+    path = Path(contract_path)
+    if path.suffix != '.sol':
+        console.print("[red]Error: File must be a Solidity contract (.sol)[/red]")
+        return
+    
+    contract_name = path.stem
+    
+    if interactive:
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console
+        ) as progress:
+            
+            # Scan for vulnerabilities and gas optimizations
+            task1 = progress.add_task("Analyzing contract...", total=None)
+            vulnerabilities, gas_optimizations = run_analyses(contract_path, parser)
+            progress.update(task1, completed=True)
+            
+            # Generate report
+            task2 = progress.add_task("Generating report...", total=None)
+            report_path = _write_report(contract_path, contract_name, output,
+                                        vulnerabilities, gas_optimizations)
+            progress.update(task2, completed=True)
+    else:
+        console.print("Analyzing contract...")
+        vulnerabilities, gas_optimizations = run_analyses(contract_path, parser)
+        
+        console.print("Generating report...")
+        report_path = _write_report(contract_path, contract_name, output,
+                                    vulnerabilities, gas_optimizations)
+    
+    # Display results
+    console.print("\n")
+    display_results(vulnerabilities, gas_optimizations, verbose)
+    
+    console.print(f"\n✅ [green]Report saved to:[/green] [bold]{report_path}[/bold]")
+    console.print(f"📊 [blue]Total Issues Found:[/blue] {len(vulnerabilities) + len(gas_optimizations)}\n")
+
+
+command = scan
@@ -0,0 +1,23 @@
+"""
+Secudity CLI - version command
+"""
+
+import click
+
+__version__ = '1.0.0'
+
+VERSION_BANNER = (
+    f"Secudity Audit Toolkit v{__version__}\n\n"
+    "Automated Smart Contract Security Analysis\n"
+    "Security + Solidity = Secudity\n\n"
+    "Instagram: @secudity"
+)
+
+
+@click.command('version')
+def version():
+    """Display version information"""
+    click.echo(VERSION_BANNER)
+
+
+command = version
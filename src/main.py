@@ -2,7 +2,15 @@
 Secudity Audit Toolkit - Main Entry Point
 """
 
-from cli import cli
+import os
+import sys
+
+# When run as `python src/main.py` the script's directory is sys.path[0];
+# point that entry at the repository root instead so `src` is importable.
+if __name__ == '__main__' and not __package__:
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from src.cli import cli
 
 if __name__ == '__main__':
     cli()
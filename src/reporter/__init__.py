@@ -0,0 +1,29 @@
+"""
+Secudity Reporter
+Audit report generation
+"""
+
+import importlib
+
+__all__ = [
+    "generate_markdown_report",
+]
+
+# Public name -> submodule defining it. Submodules are only imported the
+# first time one of their names is accessed on the package.
+_LAZY_EXPORTS = {
+    "generate_markdown_report": "markdown_generator",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{_LAZY_EXPORTS[name]}")
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -3,19 +3,99 @@ Secudity Markdown Report Generator
 Generates professional audit reports in Markdown format
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
+import io
+import string
+from pathlib import Path
+from collections import Counter, defaultdict
 from datetime import datetime
-from typing import List
-from scanner.vulnerability_detector import Vulnerability, Severity
-from scanner.gas_analyzer import GasOptimization
+from operator import attrgetter
+from typing import List, Optional, TextIO
+from src.scanner.vulnerability_detector import Vulnerability, Severity
+from src.scanner.gas_analyzer import GasOptimization
+
+_SEVERITY_ICONS = {
+    Severity.CRITICAL: "🔴",
+    Severity.HIGH: "🟠",
+    Severity.MEDIUM: "🟡",
+    Severity.LOW: "🔵",
+    Severity.INFORMATIONAL: "ℹ️"
+}
+
+# Severity rows of the executive summary's findings table, in display order
+_SUMMARY_ROWS = (
+    (Severity.CRITICAL, "🔴 Critical"),
+    (Severity.HIGH, "🟠 High"),
+    (Severity.MEDIUM, "🟡 Medium"),
+    (Severity.LOW, "🔵 Low"),
+    (Severity.INFORMATIONAL, "ℹ️ Informational"),
+)
+
+_severity = attrgetter('severity')
+
+# Markdown metacharacters that would otherwise be interpreted when finding
+# text is placed in prose (code snippets and `code` spans are left as-is)
+_MD_ESCAPE = str.maketrans({
+    "|": "\\|",
+    "`": "\\`",
+    "*": "\\*",
+    "_": "\\_",
+})
+
+
+def _md(text: str) -> str:
+    """Escape markdown metacharacters in finding text"""
+    return text.translate(_MD_ESCAPE) if text else ""
 
 
 class MarkdownReportGenerator:
     """Generates comprehensive audit reports in Markdown"""
     
+    # Static header/footer text, parsed once per process and filled in per report
+    _HEADER_TPL = string.Template("""# 🔐 Smart Contract Security Audit Report
+
+**Contract:** `$name`  
+**File:** `$path`  
+**Audit Date:** $ts  
+**Auditor:** Secudity Team  
+**Tool:** Secudity Audit Toolkit v1.0.0
+
+---
+
+![Secudity](https://img.shields.io/badge/Secudity-Security%20%2B%20Solidity-blue)
+![Status](https://img.shields.io/badge/Status-Completed-green)
+
+**Secudity** - Where Security meets Solidity  
+Instagram: [@secudity](https://instagram.com/secudity)""")
+    
+    _FOOTER_TPL = string.Template("""## 📝 Disclaimer
+
+This automated audit report is generated by **Secudity Audit Toolkit** and should be used as a supplementary tool. It does not replace professional manual security audits.
+
+### Limitations
+
+- Automated tools may produce false positives
+- Complex vulnerabilities may not be detected
+- Business logic issues require manual review
+- Social engineering attacks are not covered
+
+### Next Steps
+
+1. Review all findings in this report
+2. Fix critical and high severity issues
+3. Conduct manual code review
+4. Consider professional security audit
+5. Test thoroughly on testnet
+
+---
+
+**Report Generated:** $ts  
+**Tool Version:** Secudity Audit Toolkit v1.0.0  
+**Contact:** [Instagram @secudity](https://instagram.com/secudity)
+
+---
+
+*Secudity - Where Security meets Solidity* 🔐""")
+    
     def __init__(self, contract_path: str, contract_name: str):
         self.contract_path = contract_path
         self.contract_name = contract_name
@@ -24,63 +104,67 @@ class MarkdownReportGenerator:
     def generate_report(
         self,
         vulnerabilities: List[Vulnerability],
-        gas_optimizations: List[GasOptimization]
-    ) -> str:
-        """Generate complete audit report"""
+        gas_optimizations: List[GasOptimization],
+        out: Optional[TextIO] = None
+    ) -> Optional[str]:
+        """
+        Generate complete audit report
         
-        report = []
+        The report is written to ``out`` as it is rendered. When no stream
+        is given it is rendered in memory and returned as a string.
+        """
+        
+        buf = out if out is not None else io.StringIO()
         
         # Header
-        report.append(self._generate_header())
+        self._write_header(buf)
+        buf.write('\n\n')
         
         # Executive Summary
-        report.append(self._generate_executive_summary(vulnerabilities, gas_optimizations))
+        self._write_executive_summary(buf, vulnerabilities, gas_optimizations)
+        buf.write('\n\n')
         
         # Vulnerability Findings
-        report.append(self._generate_vulnerability_section(vulnerabilities))
+        self._write_vulnerability_section(buf, vulnerabilities)
+        buf.write('\n\n')
         
         # Gas Optimization Findings
-        report.append(self._generate_gas_section(gas_optimizations))
+        self._write_gas_section(buf, gas_optimizations)
+        buf.write('\n\n')
         
         # Recommendations
-        report.append(self._generate_recommendations(vulnerabilities))
+        self._write_recommendations(buf, vulnerabilities)
+        buf.write('\n\n')
         
         # Footer
-        report.append(self._generate_footer())
+        self._write_footer(buf)
         
-        return '\n\n'.join(report)
+        if out is None:
+            return buf.getvalue()
+        return None
     
-    def _generate_header(self) -> str:
-        """Generate report header"""
-        return f"""# 🔐 Smart Contract Security Audit Report
-
-**Contract:** `{self.contract_name}`  
-**File:** `{self.contract_path}`  
-**Audit Date:** {self.timestamp}  
-**Auditor:** Secudity Team  
-**Tool:** Secudity Audit Toolkit v1.0.0
-
----
-
-![Secudity](https://img.shields.io/badge/Secudity-Security%20%2B%20Solidity-blue)
-![Status](https://img.shields.io/badge/Status-Completed-green)
-
-**Secudity** - Where Security meets Solidity  
-Instagram: [@secudity](https://instagram.com/secudity)"""
+    def _write_header(self, buf):
+        """Write report header"""
+        buf.write(self._HEADER_TPL.substitute(
+            name=self.contract_name,
+            path=self.contract_path,
+            ts=self.timestamp
+        ))
     
-    def _generate_executive_summary(
+    def _write_executive_summary(
         self,
+        buf,
         vulnerabilities: List[Vulnerability],
         gas_optimizations: List[GasOptimization]
-    ) -> str:
-        """Generate executive summary"""
+    ):
+        """Write executive summary"""
         
         # Count by severity
-        critical = sum(1 for v in vulnerabilities if v.severity == Severity.CRITICAL)
-        high = sum(1 for v in vulnerabilities if v.severity == Severity.HIGH)
-        medium = sum(1 for v in vulnerabilities if v.severity == Severity.MEDIUM)
-        low = sum(1 for v in vulnerabilities if v.severity == Severity.LOW)
-        info = sum(1 for v in vulnerabilities if v.severity == Severity.INFORMATIONAL)
+        counts = Counter(map(_severity, vulnerabilities))
+        critical = counts[Severity.CRITICAL]
+        high = counts[Severity.HIGH]
+        medium = counts[Severity.MEDIUM]
+        low = counts[Severity.LOW]
         
         # Determine overall risk
         if critical > 0:
@@ -99,7 +183,7 @@ Instagram: [@secudity](https://instagram.com/secudity)"""
             risk_level = "✅ **MINIMAL RISK**"
             recommendation = "Contract appears secure"
         
-        return f"""## 📊 Executive Summary
+        buf.write(f"""## 📊 Executive Summary
 
 ### Overall Risk Assessment
 {risk_level}
@@ -110,90 +194,92 @@ Instagram: [@secudity](https://instagram.com/secudity)"""
 
 | Severity | Count |
 |----------|-------|
-| 🔴 Critical | {critical} |
-| 🟠 High | {high} |
-| 🟡 Medium | {medium} |
-| 🔵 Low | {low} |
-| ℹ️ Informational | {info} |
-| **Total Vulnerabilities** | **{len(vulnerabilities)}** |
+""")
+        for severity, label in _SUMMARY_ROWS:
+            buf.write(f"| {label} | {counts[severity]} |\n")
+        buf.write(f"""| **Total Vulnerabilities** | **{len(vulnerabilities)}** |
 | ⚡ Gas Optimizations | {len(gas_optimizations)} |
 
 ### Key Concerns
 
-{self._generate_key_concerns(vulnerabilities)}
+""")
+        self._write_key_concerns(buf, vulnerabilities)
+        buf.write("""
 
----"""
+---""")
     
-    def _generate_key_concerns(self, vulnerabilities: List[Vulnerability]) -> str:
-        """Generate key concerns section"""
+    def _write_key_concerns(self, buf, vulnerabilities: List[Vulnerability]):
+        """Write key concerns section"""
         critical_and_high = [v for v in vulnerabilities 
                             if v.severity in [Severity.CRITICAL, Severity.HIGH]]
         
         if not critical_and_high:
-            return "✅ No critical or high severity issues found."
-        
-        concerns = []
-        for vuln in critical_and_high[:5]:  # Top 5
-            concerns.append(f"- **{vuln.name}** (Line {vuln.line_number}): {vuln.description}")
+            buf.write("✅ No critical or high severity issues found.")
+            return
         
-        return '\n'.join(concerns)
+        for i, vuln in enumerate(critical_and_high[:5]):  # Top 5
+            if i:
+                buf.write('\n')
+            buf.write(f"- **{_md(vuln.name)}** (Line {vuln.line_number}): {_md(vuln.description)}")
     
-    def _generate_vulnerability_section(self, vulnerabilities: List[Vulnerability]) -> str:
-        """Generate detailed vulnerability findings"""
+    def _write_vulnerability_section(self, buf, vulnerabilities: List[Vulnerability]):
+        """Write detailed vulnerability findings"""
         
         if not vulnerabilities:
-            return """## 🛡️ Security Findings
+            buf.write("""## 🛡️ Security Findings
 
 ### ✅ No Vulnerabilities Detected
 
 The automated scan did not detect any security vulnerabilities. However, manual review is always recommended for production contracts.
 
----"""
+---""")
+            return
         
-        sections = ["""## 🛡️ Security Findings
+        buf.write("""## 🛡️ Security Findings
 
 ### Detailed Vulnerability Analysis
 
 The following security issues were identified during the automated scan:
 
----"""]
+---""")
         
         # Group by severity
+        by_severity = defaultdict(list)
+        for vuln in vulnerabilities:
+            by_severity[vuln.severity].append(vuln)
+        
         for severity in [Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM, 
                         Severity.LOW, Severity.INFORMATIONAL]:
-            severity_vulns = [v for v in vulnerabilities if v.severity == severity]
+            severity_vulns = by_severity.get(severity)
             
             if severity_vulns:
-                sections.append(self._generate_severity_section(severity, severity_vulns))
-        
-        return '\n\n'.join(sections)
+                buf.write('\n\n')
+                self._write_severity_section(buf, severity, severity_vulns)
     
-    def _generate_severity_section(
+    def _write_severity_section(
         self,
+        buf,
         severity: Severity,
         vulnerabilities: List[Vulnerability]
-    ) -> str:
-        """Generate section for specific severity level"""
+    ):
+        """Write section for specific severity level"""
         
-        icons = {
-            Severity.CRITICAL: "🔴",
-            Severity.HIGH: "🟠",
-            Severity.MEDIUM: "🟡",
-            Severity.LOW: "🔵",
-            Severity.INFORMATIONAL: "ℹ️"
-        }
-        
-        icon = icons.get(severity, "")
-        section = [f"### {icon} {severity.value} Severity Issues ({len(vulnerabilities)})"]
+        icon = _SEVERITY_ICONS.get(severity, "")
+        buf.write(f"### {icon} {severity.value} Severity Issues ({len(vulnerabilities)})")
         
         for i, vuln in enumerate(vulnerabilities, 1):
-            section.append(f"""
-#### {i}. {vuln.name}
+            self._write_vuln(buf, i, vuln)
+    
+    def _write_vuln(self, buf, index: int, vuln: Vulnerability):
+        """Write a single numbered vulnerability entry"""
+        buf.write(f"""
+
+#### {index}. {_md(vuln.name)}
 
 **Location:** `{vuln.location}:{vuln.line_number}`
 
 **Description:**  
-{vuln.description}
+{_md(vuln.description)}
 
 **Code Snippet:**
 ```solidity
@@ -201,45 +287,47 @@ The following security issues were identified during the automated scan:
 ```
 
 **Recommendation:**  
-{vuln.recommendation}
+{_md(vuln.recommendation)}
 
 {f'**Reference:** [{vuln.reference}]({vuln.reference})' if vuln.reference else ''}
 
 ---""")
-        
-        return '\n'.join(section)
     
-    def _generate_gas_section(self, optimizations: List[GasOptimization]) -> str:
-        """Generate gas optimization section"""
+    def _write_gas_section(self, buf, optimizations: List[GasOptimization]):
+        """Write gas optimization section"""
         
         if not optimizations:
-            return """## ⚡ Gas Optimization
+            buf.write("""## ⚡ Gas Optimization
 
 ### ✅ No Major Gas Optimizations Found
 
 The contract appears to follow gas-efficient patterns. However, there may still be minor optimizations possible through manual review.
 
----"""
+---""")
+            return
         
-        section = [f"""## ⚡ Gas Optimization Opportunities
+        buf.write(f"""## ⚡ Gas Optimization Opportunities
 
 Found **{len(optimizations)}** opportunities to reduce gas costs:
 
----"""]
+---""")
         
         # Group by category
-        categories = {}
+        categories = defaultdict(list)
         for opt in optimizations:
-            if opt.category not in categories:
-                categories[opt.category] = []
             categories[opt.category].append(opt)
         
         for category, opts in categories.items():
-            section.append(f"### {category} ({len(opts)} issues)\n")
+            buf.write(f"\n### {category} ({len(opts)} issues)\n")
             
             for i, opt in enumerate(opts, 1):
-                section.append(f"""
-#### {i}. Line {opt.line_number}: {opt.description}
+                self._write_gas_optimization(buf, i, opt)
+    
+    def _write_gas_optimization(self, buf, index: int, opt: GasOptimization):
+        """Write a single numbered gas optimization entry"""
+        buf.write(f"""
+
+#### {index}. Line {opt.line_number}: {_md(opt.description)}
 
 **Code:**
 ```solidity
@@ -247,22 +335,22 @@ Found **{len(optimizations)}** opportunities to reduce gas costs:
 ```
 
 **Suggestion:**  
-{opt.suggestion}
+{_md(opt.suggestion)}
 
 **Estimated Gas Savings:** {opt.estimated_savings}
 
 ---""")
-        
-        return '\n'.join(section)
     
-    def _generate_recommendations(self, vulnerabilities: List[Vulnerability]) -> str:
-        """Generate recommendations section"""
+    def _write_recommendations(self, buf, vulnerabilities: List[Vulnerability]):
+        """Write recommendations section"""
         
-        return f"""## 📋 Recommendations
+        buf.write("""## 📋 Recommendations
 
 ### Immediate Actions Required
 
-{self._generate_immediate_actions(vulnerabilities)}
+""")
+        self._write_immediate_actions(buf, vulnerabilities)
+        buf.write("""
 
 ### Best Practices
 
@@ -292,59 +380,33 @@ Found **{len(optimizations)}** opportunities to reduce gas costs:
 - [OpenZeppelin Security](https://docs.openzeppelin.com/contracts/4.x/security)
 - [SWC Registry](https://swcregistry.io/)
 
----"""
+---""")
     
-    def _generate_immediate_actions(self, vulnerabilities: List[Vulnerability]) -> str:
-        """Generate immediate action items"""
+    def _write_immediate_actions(self, buf, vulnerabilities: List[Vulnerability]):
+        """Write immediate action items"""
         critical_high = [v for v in vulnerabilities 
                         if v.severity in [Severity.CRITICAL, Severity.HIGH]]
         
         if not critical_high:
-            return "✅ No critical issues requiring immediate action."
+            buf.write("✅ No critical issues requiring immediate action.")
+            return
         
-        actions = []
         for i, vuln in enumerate(critical_high, 1):
-            actions.append(f"{i}. **Fix {vuln.name}** (Line {vuln.line_number}) - {vuln.recommendation}")
-        
-        return '\n'.join(actions)
+            if i > 1:
+                buf.write('\n')
+            buf.write(f"{i}. **Fix {_md(vuln.name)}** (Line {vuln.line_number}) - {_md(vuln.recommendation)}")
     
-    def _generate_footer(self) -> str:
-        """Generate report footer"""
-        return f"""## 📝 Disclaimer
-
-This automated audit report is generated by **Secudity Audit Toolkit** and should be used as a supplementary tool. It does not replace professional manual security audits.
-
-### Limitations
-
-- Automated tools may produce false positives
-- Complex vulnerabilities may not be detected
-- Business logic issues require manual review
-- Social engineering attacks are not covered
-
-### Next Steps
-
-1. Review all findings in this report
-2. Fix critical and high severity issues
-3. Conduct manual code review
-4. Consider professional security audit
-5. Test thoroughly on testnet
-
----
-
-**Report Generated:** {self.timestamp}  
-**Tool Version:** Secudity Audit Toolkit v1.0.0  
-**Contact:** [Instagram @secudity](https://instagram.com/secudity)
-
----
-
-*Secudity - Where Security meets Solidity* 🔐"""
+    def _write_footer(self, buf):
+        """Write report footer"""
+        buf.write(self._FOOTER_TPL.substitute(ts=self.timestamp))
 
 
 def generate_markdown_report(
     contract_path: str,
     vulnerabilities: List[Vulnerability],
     gas_optimizations: List[GasOptimization],
-    output_path: str
+    output_path: str,
+    contract_name: Optional[str] = None
 ) -> str:
     """
     Generate and save markdown report
@@ -354,18 +416,20 @@ def generate_markdown_report(
         vulnerabilities: List of detected vulnerabilities
         gas_optimizations: List of gas optimizations
         output_path: Where to save the report
+        contract_name: Contract name for the report title (defaults to the
+            file name without its extension)
         
     Returns:
         Path to generated report
     """
-    import os
-    
-    contract_name = os.path.basename(contract_path).replace('.sol', '')
+    if contract_name is None:
+        contract_name = Path(contract_path).stem
     generator = MarkdownReportGenerator(contract_path, contract_name)
     
-    report = generator.generate_report(vulnerabilities, gas_optimizations)
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(report)
+    # Stream straight into the file rather than building the report in memory.
+    # newline='' skips newline translation, which also keeps LF endings on
+    # every platform.
+    with open(output_path, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
+        generator.generate_report(vulnerabilities, gas_optimizations, f)
     
     return output_path
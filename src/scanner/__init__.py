@@ -0,0 +1,39 @@
+"""
+Secudity Scanner
+Vulnerability detection and gas analysis for Solidity contracts
+"""
+
+import importlib
+
+__all__ = [
+    "analyze_contract",
+    "Severity",
+    "Vulnerability",
+    "analyze_gas",
+    "analyze_gas_many",
+    "GasOptimization",
+]
+
+# Public name -> submodule defining it. Submodules are only imported the
+# first time one of their names is accessed on the package.
+_LAZY_EXPORTS = {
+    "analyze_contract": "vulnerability_detector",
+    "Severity": "vulnerability_detector",
+    "Vulnerability": "vulnerability_detector",
+    "analyze_gas": "gas_analyzer",
+    "analyze_gas_many": "gas_analyzer",
+    "GasOptimization": "gas_analyzer",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{_LAZY_EXPORTS[name]}")
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
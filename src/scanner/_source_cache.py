@@ -0,0 +1,46 @@
+"""
+Secudity Source Cache
+Reads each contract file once and shares the source between analyzers
+"""
+
+import mmap
+import os
+import stat
+from functools import lru_cache
+
+
+@lru_cache(maxsize=32)
+def _read_source(contract_path: str, mtime_ns: int, size: int) -> str:
+    if size == 0:
+        return ''
+    # Decode straight from a read-only mapping so the file is never also
+    # held as an intermediate bytes object
+    with open(contract_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            source = str(mapped, 'utf-8')
+    # Same newline handling as reading in text mode
+    if '\r' in source:
+        source = source.replace('\r\n', '\n').replace('\r', '\n')
+    return source
+
+
+def read_contract(contract_path: str) -> str:
+    """
+    Return the source of a Solidity contract, reusing earlier reads
+    
+    The cache is keyed on the file's modification time and size, so an
+    edited file is read again. Pipes and other non-regular files (e.g.
+    `<(cat file.sol)`) report no meaningful size and are read directly,
+    without caching.
+    
+    Args:
+        contract_path: Path to the Solidity contract file
+        
+    Returns:
+        Contract source code
+    """
+    st = os.stat(contract_path)
+    if not stat.S_ISREG(st.st_mode):
+        with open(contract_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    return _read_source(os.path.abspath(contract_path), st.st_mtime_ns, st.st_size)
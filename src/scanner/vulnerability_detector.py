@@ -3,11 +3,20 @@ Secudity Vulnerability Detector
 Automated detection of common smart contract vulnerabilities
 """
 
+import os
 import re
-from typing import List, Dict, Any
+import sys
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+# When run directly (`python src/scanner/<module>.py`) point sys.path at the
+# repository root so the `src` package is importable for the self-test below.
+if __name__ == '__main__' and not __package__:
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner._source_cache import read_contract
+
 
 class Severity(Enum):
     """Vulnerability severity levels"""
@@ -285,18 +294,19 @@ class VulnerabilityDetector:
         return '\n'.join(snippet_lines)
 
 
-def analyze_contract(contract_path: str) -> List[Vulnerability]:
+def analyze_contract(contract_path: str, contract_code: Optional[str] = None) -> List[Vulnerability]:
     """
     Analyze a Solidity contract for vulnerabilities
     
     Args:
         contract_path: Path to the Solidity contract file
+        contract_code: Contract source, if already loaded by the caller
         
     Returns:
         List of detected vulnerabilities
     """
-    with open(contract_path, 'r', encoding='utf-8') as f:
-        contract_code = f.read()
+    if contract_code is None:
+        contract_code = read_contract(contract_path)
     
     detector = VulnerabilityDetector(contract_code, contract_path)
     return detector.detect_all()
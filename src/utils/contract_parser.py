@@ -0,0 +1,67 @@
+"""
+Secudity Contract Parser
+Optional tree-sitter based Solidity parsing for the AST-backed analyzers
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+try:
+    import tree_sitter
+    import tree_sitter_solidity
+except ImportError:  # pip install secudity-audit-toolkit[ast]
+    tree_sitter = None
+    tree_sitter_solidity = None
+
+AST_AVAILABLE = tree_sitter is not None
+
+
+@lru_cache(maxsize=None)
+def _language():
+    if not AST_AVAILABLE:
+        raise ImportError(
+            "The AST backend requires Python 3.10+ with tree-sitter and "
+            "tree-sitter-solidity. Install them with: "
+            "pip install 'secudity-audit-toolkit[ast]'"
+        )
+    return tree_sitter.Language(tree_sitter_solidity.language())
+
+
+@lru_cache(maxsize=None)
+def _query(query_source: str):
+    return tree_sitter.Query(_language(), query_source)
+
+
+def parse_solidity(source: bytes):
+    """
+    Parse Solidity source into a syntax tree
+    
+    Args:
+        source: UTF-8 encoded contract source
+    
+    Returns:
+        Root node of the tree-sitter syntax tree
+    """
+    # Parsers are cheap and not shareable across threads, so one per call
+    language = _language()
+    parser = tree_sitter.Parser(language)
+    return parser.parse(source).root_node
+
+
+def query_matches(query_source: str, node) -> List[Tuple[int, Dict[str, list]]]:
+    """
+    Run a tree-sitter query over a syntax tree
+    
+    The query is compiled once per distinct source string.
+    
+    Returns:
+        List of (pattern index, {capture name: [nodes]}) pairs
+    """
+    return tree_sitter.QueryCursor(_query(query_source)).matches(node)
+
+
+def unwrap_expression(node):
+    """Strip the single-child expression wrappers the grammar inserts"""
+    while node.type == 'expression' and node.named_child_count == 1:
+        node = node.named_children[0]
+    return node
@@ -0,0 +1,77 @@
+"""
+Tests for the Secudity command line interface
+"""
+
+import io
+import shutil
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from src.cli import cli
+from src.cli_commands import common
+from src.scanner.gas_analyzer import analyze_gas
+from src.scanner.vulnerability_detector import Severity, Vulnerability
+
+CONTRACTS = Path(__file__).parent.parent / "test_contracts"
+
+
+def test_scan_names_report_after_file_stem(tmp_path):
+    contract = tmp_path / "My.solution.sol"
+    shutil.copy(CONTRACTS / "AccessControlIssue.sol", contract)
+    output = tmp_path / "reports"
+
+    result = CliRunner().invoke(cli, ["scan", str(contract), "-o", str(output)])
+
+    assert result.exit_code == 0, result.output
+    reports = [p.name for p in output.iterdir()]
+    assert len(reports) == 1
+    assert reports[0].startswith("My.solution_audit_")
+
+
+# Clean-contract shortcut in the results summary
+
+@pytest.fixture
+def console_output(monkeypatch):
+    """Point the shared console at a buffer and return the buffer"""
+    from rich.console import Console
+
+    buffer = io.StringIO()
+    monkeypatch.setattr(common, "_console", Console(file=buffer, width=100))
+    return buffer
+
+
+def test_no_findings_prints_clean_message(console_output):
+    common.display_results([], [], verbose=False)
+
+    assert "No issues found" in console_output.getvalue()
+
+
+def test_informational_only_still_prints_summary(console_output):
+    informational = Vulnerability(
+        name="Floating Pragma",
+        severity=Severity.INFORMATIONAL,
+        description="Pragma is not locked",
+        location="Token.sol",
+        line_number=1,
+        code_snippet="pragma solidity ^0.8.0;",
+        recommendation="Lock the pragma",
+        reference="",
+    )
+
+    common.display_results([informational], [], verbose=False)
+
+    output = console_output.getvalue()
+    assert "No issues found" not in output
+    assert "Security Findings Summary" in output
+
+
+def test_gas_only_still_prints_summary(console_output):
+    gas = analyze_gas(str(CONTRACTS / "AccessControlIssue.sol"))
+
+    common.display_results([], gas, verbose=False)
+
+    output = console_output.getvalue()
+    assert "No issues found" not in output
+    assert "Security Findings Summary" in output
@@ -0,0 +1,243 @@
+"""
+Tests for the Secudity gas analyzer
+"""
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+from src.scanner.gas_analyzer import GasAnalyzer, _analyze_gas_file, analyze_gas, analyze_gas_many
+
+CONTRACTS = sorted((Path(__file__).parent.parent / "test_contracts").glob("*.sol"))
+
+
+@pytest.fixture
+def analyze():
+    """Run the gas analyzer over inline Solidity source"""
+    def run(source, backend="regex"):
+        return GasAnalyzer(source, "Inline.sol", backend).analyze_all()
+    return run
+
+
+def findings(optimizations, category):
+    return [opt.line_number for opt in optimizations if opt.category == category]
+
+
+def summary(optimizations):
+    return [(opt.category, opt.description, opt.line_number, opt.code_snippet)
+            for opt in optimizations]
+
+
+# Function visibility and constant/immutable match whole identifiers
+
+def test_call_to_longer_name_is_not_an_internal_call(analyze):
+    source = (
+        "contract C {\n"
+        "    function pay() public {}\n"
+        "    function run() external {\n"
+        "        prepay();\n"
+        "    }\n"
+        "}\n"
+    )
+    assert findings(analyze(source), "Function Visibility") == [2]
+
+
+def test_internal_call_keeps_function_public(analyze):
+    source = (
+        "contract C {\n"
+        "    function pay() public {}\n"
+        "    function run() external {\n"
+        "        pay();\n"
+        "    }\n"
+        "}\n"
+    )
+    assert findings(analyze(source), "Function Visibility") == []
+
+
+def test_assignment_to_longer_name_does_not_modify_variable(analyze):
+    source = (
+        "contract C {\n"
+        "    uint256 public total = 5;\n"
+        "    function run() external {\n"
+        "        subtotal = 1;\n"
+        "    }\n"
+        "}\n"
+    )
+    assert findings(analyze(source), "State Variable") == [2]
+
+
+def test_assigned_variable_is_not_constant(analyze):
+    source = (
+        "contract C {\n"
+        "    uint256 public total = 5;\n"
+        "    function run() external {\n"
+        "        total = 1;\n"
+        "    }\n"
+        "}\n"
+    )
+    assert findings(analyze(source), "State Variable") == []
+
+
+# Storage reads in loops are tracked by brace depth
+
+def test_storage_read_after_nested_block_is_in_loop(analyze):
+    source = (
+        "contract C {\n"
+        "    function run(uint256 n) external {\n"
+        "        for (uint256 i = 0; i < n; ++i) {\n"
+        "            if (i > 2) {\n"
+        "                n = 1;\n"
+        "            }\n"
+        "            total += balances[msg.sender];\n"
+        "        }\n"
+        "        total = balances[msg.sender];\n"
+        "    }\n"
+        "}\n"
+    )
+    assert findings(analyze(source), "Storage Access") == [7]
+
+
+def test_storage_read_after_inner_loop_is_in_outer_loop(analyze):
+    source = (
+        "contract C {\n"
+        "    function run(uint256 n) external {\n"
+        "        for (uint256 i = 0; i < n; ++i) {\n"
+        "            for (uint256 j = 0; j < n; ++j) {\n"
+        "                total += items[j];\n"
+        "            }\n"
+        "            total += items[i];\n"
+        "        }\n"
+        "    }\n"
+        "}\n"
+    )
+    assert findings(analyze(source), "Storage Access") == [5, 7]
+
+
+def test_function_name_containing_for_is_not_a_loop(analyze):
+    source = (
+        "contract C {\n"
+        "    function performUpkeep(bytes calldata) external {\n"
+        "        if (paused) {\n"
+        "            return;\n"
+        "        }\n"
+        "        balances[a] -= 1;\n"
+        "        balances[b] += 1;\n"
+        "        users[c] = 0;\n"
+        "    }\n"
+        "}\n"
+    )
+    assert findings(analyze(source), "Storage Access") == []
+
+
+# Comments and string contents are ignored
+
+def test_comments_do_not_produce_findings(analyze):
+    source = (
+        "contract C {\n"
+        "    // function old() public {} require(x, \"no\") && msg.sender\n"
+        "    /* for (uint256 i = 0; i < items.length; i++) {\n"
+        "       balances[msg.sender]; } */\n"
+        "}\n"
+    )
+    assert analyze(source) == []
+
+
+def test_require_with_message_still_detected(analyze):
+    source = (
+        "contract C {\n"
+        "    function run(uint256 n) external {\n"
+        "        require(n > 0, \"n // must be positive\");\n"
+        "    }\n"
+        "}\n"
+    )
+    opts = analyze(source)
+    assert findings(opts, "Error Handling") == [3]
+    # Snippets come from the original source, not the blanked copy
+    assert '"n // must be positive"' in opts[0].code_snippet
+
+
+def test_string_contents_are_ignored(analyze):
+    source = (
+        "contract C {\n"
+        "    string s = \"function f() public { require(x, 'y'); }\";\n"
+        "}\n"
+    )
+    assert analyze(source) == []
+
+
+# Storage packing
+
+def test_bool_with_uint256_suggests_packing(analyze):
+    source = (
+        "contract C {\n"
+        "    uint256 public total;\n"
+        "    bool public paused;\n"
+        "}\n"
+    )
+    assert findings(analyze(source), "Storage Packing") == [2]
+
+
+def test_small_type_names_match_whole_words(analyze):
+    source = (
+        "contract C {\n"
+        "    uint256 public total;\n"
+        "    address public booleanOracle;\n"
+        "}\n"
+    )
+    assert findings(analyze(source), "Storage Packing") == []
+
+
+# Short-circuit ordering
+
+def test_msg_sender_in_second_operand(analyze):
+    source = (
+        "contract C {\n"
+        "    function run(uint256 n) external {\n"
+        "        require(n > 0 && msg.sender != owner);\n"
+        "        require(n > 0 && n < 9 && msg.sender != owner);\n"
+        "    }\n"
+        "}\n"
+    )
+    assert findings(analyze(source), "Short-Circuit Evaluation") == [3]
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        GasAnalyzer("", "Inline.sol", "slither")
+
+
+@pytest.mark.parametrize("contract", CONTRACTS, ids=lambda p: p.name)
+def test_ast_backend_matches_regex_on_bundled_contracts(contract):
+    pytest.importorskip("tree_sitter")
+    pytest.importorskip("tree_sitter_solidity")
+
+    assert summary(analyze_gas(str(contract), backend="ast")) == \
+        summary(analyze_gas(str(contract)))
+
+
+# Batch analysis across processes
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_analyze_gas_many_matches_analyze_gas(workers):
+    paths = [str(p) for p in reversed(CONTRACTS)]
+
+    results = analyze_gas_many(paths, workers=workers)
+
+    assert list(results) == paths
+    for path in paths:
+        assert summary(results[path]) == summary(analyze_gas(path))
+
+
+def test_worker_findings_are_rendered_before_pickling():
+    path = CONTRACTS[0]
+    source = path.read_text(encoding="utf-8")
+
+    optimizations = _analyze_gas_file(str(path))
+
+    assert optimizations
+    for opt in optimizations:
+        assert isinstance(opt._code_snippet, str)
+        # Only the finding travels back, not the analyzer and its source
+        assert len(pickle.dumps(opt)) < len(source)
+    assert summary(pickle.loads(pickle.dumps(optimizations))) == summary(optimizations)
@@ -0,0 +1,56 @@
+"""
+Tests for the Secudity markdown report generator
+"""
+
+import pytest
+
+from src.reporter.markdown_generator import MarkdownReportGenerator, _md, generate_markdown_report
+from src.scanner.vulnerability_detector import Severity, Vulnerability
+
+
+@pytest.fixture
+def vulnerability():
+    return Vulnerability(
+        name="Unchecked_Call",
+        severity=Severity.HIGH,
+        description="Return value of `call` | send is *ignored*",
+        location="Token.sol",
+        line_number=12,
+        code_snippet=">>> 12: a_b | `c` *d*",
+        recommendation="Check the return_value",
+        reference="",
+    )
+
+
+# Markdown escaping of finding text
+
+@pytest.mark.parametrize("text, expected", [
+    ("a|b", "a\\|b"),
+    ("`x`", "\\`x\\`"),
+    ("*bold*", "\\*bold\\*"),
+    ("snake_case", "snake\\_case"),
+    ("plain text.", "plain text."),
+    ("", ""),
+    (None, ""),
+])
+def test_md_escapes_metacharacters(text, expected):
+    assert _md(text) == expected
+
+
+def test_report_escapes_prose_but_not_snippets(vulnerability):
+    report = MarkdownReportGenerator("Token.sol", "Token").generate_report([vulnerability], [])
+
+    assert "#### 1. Unchecked\\_Call" in report
+    assert "Return value of \\`call\\` \\| send is \\*ignored\\*" in report
+    # Code snippets and location spans are copied verbatim
+    assert ">>> 12: a_b | `c` *d*" in report
+    assert "**Location:** `Token.sol:12`" in report
+
+
+# Contract name defaults to the file stem
+
+def test_contract_name_defaults_to_file_stem(tmp_path, vulnerability):
+    output = tmp_path / "report.md"
+    generate_markdown_report("contracts/My.solution.sol", [vulnerability], [], str(output))
+
+    assert "**Contract:** `My.solution`" in output.read_text(encoding="utf-8")
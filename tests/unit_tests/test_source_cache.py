@@ -0,0 +1,69 @@
+"""
+Tests for the shared contract source cache
+"""
+
+import os
+import threading
+
+import pytest
+
+from src.scanner._source_cache import _read_source, read_contract
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    _read_source.cache_clear()
+    yield
+    _read_source.cache_clear()
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (b"a\r\nb\r\n", "a\nb\n"),
+    (b"a\rb\r", "a\nb\n"),
+    (b"a\r\nb\rc\n", "a\nb\nc\n"),
+    (b"a\nb\n", "a\nb\n"),
+])
+def test_newlines_match_text_mode(tmp_path, raw, expected):
+    contract = tmp_path / "C.sol"
+    contract.write_bytes(raw)
+
+    assert read_contract(str(contract)) == expected
+    with open(contract, "r", encoding="utf-8") as f:
+        assert f.read() == expected
+
+
+def test_empty_file(tmp_path):
+    contract = tmp_path / "Empty.sol"
+    contract.write_bytes(b"")
+
+    assert read_contract(str(contract)) == ""
+
+
+def test_edited_file_is_read_again(tmp_path):
+    contract = tmp_path / "C.sol"
+    contract.write_text("contract A {}\n", encoding="utf-8")
+    assert read_contract(str(contract)) == "contract A {}\n"
+
+    contract.write_text("contract Bb {}\n", encoding="utf-8")
+    assert read_contract(str(contract)) == "contract Bb {}\n"
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs named pipes")
+def test_pipe_is_read_in_full_and_not_cached(tmp_path):
+    pipe = tmp_path / "C.sol"
+    os.mkfifo(pipe)
+    source = "contract A {\r\n}\r\n"
+
+    def feed():
+        with open(pipe, "w", encoding="utf-8", newline="") as f:
+            f.write(source)
+
+    # Daemon so a reader that never opens the pipe cannot hang the run
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+    try:
+        assert read_contract(str(pipe)) == "contract A {\n}\n"
+    finally:
+        writer.join(timeout=5)
+
+    assert _read_source.cache_info().currsize == 0